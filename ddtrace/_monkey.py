@@ -280,3 +280,10 @@ def _get_patched_modules():
     """Get the list of patched modules"""
     with _LOCK:
         return sorted(_PATCHED_MODULES)
+
+
+def _is_module_patched(module):
+    # type: (str) -> bool
+    """Check whether the given module is patched"""
+    with _LOCK:
+        return module in _PATCHED_MODULES
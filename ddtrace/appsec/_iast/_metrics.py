@@ -114,9 +114,9 @@ def _set_metric_iast_executed_source(source_type):
 
 
 @metric_verbosity(TELEMETRY_INFORMATION_VERBOSITY)
-def _set_metric_iast_executed_sink(vulnerability_type):
+def _set_metric_iast_executed_sink(vulnerability_type, counter=1):
     telemetry.telemetry_writer.add_count_metric(
-        TELEMETRY_NAMESPACE_TAG_IAST, "executed.sink", 1, (("vulnerability_type", vulnerability_type),)
+        TELEMETRY_NAMESPACE_TAG_IAST, "executed.sink", counter, (("vulnerability_type", vulnerability_type),)
     )
 
 
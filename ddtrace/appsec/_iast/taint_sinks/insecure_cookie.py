@@ -1,3 +1,4 @@
+import string
 from typing import Dict
 from typing import Optional
 
@@ -14,6 +15,10 @@ from ..constants import VULN_NO_SAMESITE_COOKIE
 from ..taint_sinks._base import VulnerabilityBase
 
 
+# Lowercase ASCII and drop spaces in a single pass
+_COOKIE_TRANS = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, " ")
+
+
 @oce.register
 class InsecureCookie(VulnerabilityBase):
     vulnerability_type = VULN_INSECURE_COOKIE
@@ -33,47 +38,67 @@ class NoSameSite(VulnerabilityBase):
     skip_location = True
 
 
+# The sink classes are fixed after import, so resolve their report classmethods once
+_report_insecure_cookie = InsecureCookie.report
+_report_no_httponly_cookie = NoHttpOnlyCookie.report
+_report_no_samesite_cookie = NoSameSite.report
+
+
 def asm_check_cookies(cookies: Optional[Dict[str, str]]) -> None:
-    if not cookies:
+    if not cookies or not (_is_iast_enabled() and is_iast_request_enabled()):
         return
-    if _is_iast_enabled() and is_iast_request_enabled():
-        try:
-            for cookie_key, cookie_value in cookies.items():
-                lvalue = cookie_value.lower().replace(" ", "")
-                # If lvalue starts with ";" means that the cookie is empty, like ';httponly;path=/;samesite=strict'
-                if lvalue == "" or lvalue.startswith(";") or lvalue.startswith('""'):
-                    continue
-
-                if ";secure" not in lvalue:
-                    increment_iast_span_metric(
-                        IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK, InsecureCookie.vulnerability_type
-                    )
-                    _set_metric_iast_executed_sink(InsecureCookie.vulnerability_type)
-                    InsecureCookie.report(evidence_value=cookie_key)
-
-                if ";httponly" not in lvalue:
-                    increment_iast_span_metric(
-                        IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK, NoHttpOnlyCookie.vulnerability_type
-                    )
-                    _set_metric_iast_executed_sink(NoHttpOnlyCookie.vulnerability_type)
-                    NoHttpOnlyCookie.report(evidence_value=cookie_key)
-
-                if ";samesite=" in lvalue:
-                    ss_tokens = lvalue.split(";samesite=")
-                    if len(ss_tokens) <= 1:
-                        report_samesite = True
-                    else:
-                        ss_tokens[1] = ss_tokens[1].lower()
-                        if ss_tokens[1].startswith("strict") or ss_tokens[1].startswith("lax"):
-                            report_samesite = False
-                        else:
-                            report_samesite = True
-                else:
-                    report_samesite = True
-
-                if report_samesite:
-                    increment_iast_span_metric(IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK, NoSameSite.vulnerability_type)
-                    _set_metric_iast_executed_sink(NoSameSite.vulnerability_type)
-                    NoSameSite.report(evidence_value=cookie_key)
-        except Exception as e:
-            iast_taint_log_error("[IAST] error in asm_check_cookies. {}".format(e))
+    try:
+        _asm_check_cookies(cookies)
+    except Exception as e:
+        iast_taint_log_error("[IAST] error in asm_check_cookies. {}".format(e))
+
+
+def _asm_check_cookies(cookies: Dict[str, str]) -> None:
+    # Collect the offending cookie keys first so each sink metric is updated once per call
+    insecure_keys = []
+    no_httponly_keys = []
+    no_samesite_keys = []
+    for cookie_key, cookie_value in cookies.items():
+        # Fast path for compliant cookies using the attribute spelling emitted by http.cookies.Morsel,
+        # which avoids normalizing the value at all
+        if (
+            "; Secure" in cookie_value
+            and "; HttpOnly" in cookie_value
+            and ("; SameSite=Strict" in cookie_value or "; SameSite=Lax" in cookie_value)
+        ):
+            continue
+
+        lvalue = cookie_value.translate(_COOKIE_TRANS)
+        # If lvalue starts with ";" means that the cookie is empty, like ';httponly;path=/;samesite=strict'
+        if not lvalue:
+            continue
+        c0 = lvalue[0]
+        if c0 == ";" or (c0 == '"' and lvalue[:2] == '""'):
+            continue
+
+        if ";" not in lvalue:
+            # No attributes at all, so a single scan is enough to know every check fails
+            insecure_keys.append(cookie_key)
+            no_httponly_keys.append(cookie_key)
+            no_samesite_keys.append(cookie_key)
+            continue
+
+        if ";secure" not in lvalue:
+            insecure_keys.append(cookie_key)
+        if ";httponly" not in lvalue:
+            no_httponly_keys.append(cookie_key)
+        ss_idx = lvalue.find(";samesite=")
+        if ss_idx < 0 or not lvalue.startswith(("strict", "lax"), ss_idx + 10):
+            no_samesite_keys.append(cookie_key)
+
+    for vulnerability_type, report, cookie_keys in (
+        (VULN_INSECURE_COOKIE, _report_insecure_cookie, insecure_keys),
+        (VULN_NO_HTTPONLY_COOKIE, _report_no_httponly_cookie, no_httponly_keys),
+        (VULN_NO_SAMESITE_COOKIE, _report_no_samesite_cookie, no_samesite_keys),
+    ):
+        if not cookie_keys:
+            continue
+        increment_iast_span_metric(IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK, vulnerability_type, len(cookie_keys))
+        _set_metric_iast_executed_sink(vulnerability_type, len(cookie_keys))
+        for cookie_key in cookie_keys:
+            report(evidence_value=cookie_key)
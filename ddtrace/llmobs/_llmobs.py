@@ -1,9 +1,11 @@
+import inspect
 import json
 import os
-import time
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import ddtrace
@@ -16,6 +18,7 @@ from ddtrace.internal import atexit
 from ddtrace.internal import forksafe
 from ddtrace.internal._rand import rand64bits
 from ddtrace.internal.compat import ensure_text
+from ddtrace.internal.compat import time_ns
 from ddtrace.internal.logger import get_logger
 from ddtrace.internal.remoteconfig.worker import remoteconfig_poller
 from ddtrace.internal.service import Service
@@ -62,6 +65,12 @@ from ddtrace.propagation.http import HTTPPropagator
 
 log = get_logger(__name__)
 
+# bound once, the span type is checked on every span start
+_SPAN_TYPE_LLM = SpanTypes.LLM
+
+# "numerical" is still accepted and converted to "score"
+_VALID_METRIC_TYPES = frozenset(("categorical", "numerical", "score"))
+
 
 SUPPORTED_LLMOBS_INTEGRATIONS = {
     "anthropic": "anthropic",
@@ -71,27 +80,34 @@ SUPPORTED_LLMOBS_INTEGRATIONS = {
     "google_generativeai": "google_generativeai",
 }
 
+_LLMOBS_INTEGRATIONS_PATCH_KWARGS = {integration: True for integration in SUPPORTED_LLMOBS_INTEGRATIONS.values()}
+
 
 class LLMObs(Service):
     _instance = None  # type: LLMObs
     enabled = False
+    # span kind -> name of the method tagging its input/output data, other span kinds are tagged as text
+    _IO_TAGGERS = {"llm": "_tag_llm_io", "embedding": "_tag_embedding_io", "retrieval": "_tag_retrieval_io"}
 
     def __init__(self, tracer=None):
         super(LLMObs, self).__init__()
         self.tracer = tracer or ddtrace.tracer
         self._llmobs_span_writer = None
 
+        writer_interval = float(os.getenv("_DD_LLMOBS_WRITER_INTERVAL", 1.0))
+        writer_timeout = float(os.getenv("_DD_LLMOBS_WRITER_TIMEOUT", 5.0))
+
         self._llmobs_span_writer = LLMObsSpanWriter(
             is_agentless=config._llmobs_agentless_enabled,
-            interval=float(os.getenv("_DD_LLMOBS_WRITER_INTERVAL", 1.0)),
-            timeout=float(os.getenv("_DD_LLMOBS_WRITER_TIMEOUT", 5.0)),
+            interval=writer_interval,
+            timeout=writer_timeout,
         )
 
         self._llmobs_eval_metric_writer = LLMObsEvalMetricWriter(
             site=config._dd_site,
             api_key=config._dd_api_key,
-            interval=float(os.getenv("_DD_LLMOBS_WRITER_INTERVAL", 1.0)),
-            timeout=float(os.getenv("_DD_LLMOBS_WRITER_TIMEOUT", 5.0)),
+            interval=writer_interval,
+            timeout=writer_timeout,
         )
 
         self._evaluator_runner = EvaluatorRunner(
@@ -100,23 +116,31 @@ class LLMObs(Service):
         )
 
         self._trace_processor = LLMObsTraceProcessor(self._llmobs_span_writer, self._evaluator_runner)
-        forksafe.register(self._child_after_fork)
+        self._trace_processor_installed = False
+        # fork and span start hooks are only registered while the service is running
+        self._hooks_registered = False
 
-        self._annotations = []
+        # annotation context id -> [(annotation id, annotation kwargs), ...] in registration order
+        self._annotations = {}  # type: Dict[Any, List[Tuple[int, Dict[str, Any]]]]
         self._annotation_context_lock = forksafe.RLock()
-        self.tracer.on_start_span(self._do_annotations)
 
     def _do_annotations(self, span):
         # get the current span context
         # only do the annotations if it matches the context
-        if span.span_type != SpanTypes.LLM:  # do this check to avoid the warning log in `annotate`
+        if span.span_type != _SPAN_TYPE_LLM:  # do this check to avoid the warning log in `annotate`
+            return
+        if not self._instance._annotations:  # skip the context lookup when no annotation context is active
             return
-        current_context = self._instance.tracer.current_trace_context()
-        current_context_id = current_context.get_baggage_item(ANNOTATIONS_CONTEXT_ID)
+        # the span shares its trace context with the active one, read the baggage from it directly
+        current_context_id = span.context.get_baggage_item(ANNOTATIONS_CONTEXT_ID)
         with self._annotation_context_lock:
-            for _, context_id, annotation_kwargs in self._instance._annotations:
-                if current_context_id == context_id:
-                    self.annotate(span, **annotation_kwargs)
+            annotations = self._instance._annotations.get(current_context_id)
+            if not annotations:
+                return
+            # copy the matching annotations so that the spans are annotated outside of the lock
+            annotations = list(annotations)
+        for _, annotation_kwargs in annotations:
+            self.annotate(span, **annotation_kwargs)
 
     def _child_after_fork(self):
         self._llmobs_span_writer = self._llmobs_span_writer.recreate()
@@ -128,10 +152,18 @@ class LLMObs(Service):
             self._start_service()
 
     def _start_service(self) -> None:
-        tracer_filters = self.tracer._filters
-        if not any(isinstance(tracer_filter, LLMObsTraceProcessor) for tracer_filter in tracer_filters):
-            tracer_filters += [self._trace_processor]
-            self.tracer.configure(settings={"FILTERS": tracer_filters})
+        # The tracer keeps its filters across forks, so the processor only needs to be installed once
+        if not self._trace_processor_installed:
+            tracer_filters = self.tracer._filters
+            if not any(isinstance(tracer_filter, LLMObsTraceProcessor) for tracer_filter in tracer_filters):
+                tracer_filters += [self._trace_processor]
+                self.tracer.configure(settings={"FILTERS": tracer_filters})
+            self._trace_processor_installed = True
+        # registered hooks survive a fork, so the child must not register them a second time
+        if not self._hooks_registered:
+            forksafe.register(self._child_after_fork)
+            self.tracer.on_start_span(self._do_annotations)
+            self._hooks_registered = True
         try:
             self._llmobs_span_writer.start()
             self._llmobs_eval_metric_writer.start()
@@ -155,8 +187,12 @@ class LLMObs(Service):
         except ServiceStatusError:
             log.debug("Error stopping evaluator runner")
 
-        try:
+        if self._hooks_registered:
             forksafe.unregister(self._child_after_fork)
+            self.tracer.deregister_on_start_span(self._do_annotations)
+            self._hooks_registered = False
+
+        try:
             self.tracer.shutdown()
         except Exception:
             log.warning("Failed to shutdown tracer", exc_info=True)
@@ -209,19 +245,15 @@ class LLMObs(Service):
                 "Ensure this configuration is set before running your application."
             )
 
-        config._llmobs_agentless_enabled = agentless_enabled or config._llmobs_agentless_enabled
-        if config._llmobs_agentless_enabled:
+        agentless_enabled = config._llmobs_agentless_enabled = agentless_enabled or config._llmobs_agentless_enabled
+        if agentless_enabled:
             # validate required values for agentless LLMObs
-            if not config._dd_api_key:
-                raise ValueError(
-                    "DD_API_KEY is required for sending LLMObs data when agentless mode is enabled. "
-                    "Ensure this configuration is set before running your application."
-                )
-            if not config._dd_site:
-                raise ValueError(
-                    "DD_SITE is required for sending LLMObs data when agentless mode is enabled. "
-                    "Ensure this configuration is set before running your application."
-                )
+            for required_value, required_config in ((config._dd_api_key, "DD_API_KEY"), (config._dd_site, "DD_SITE")):
+                if not required_value:
+                    raise ValueError(
+                        "{} is required for sending LLMObs data when agentless mode is enabled. "
+                        "Ensure this configuration is set before running your application.".format(required_config)
+                    )
             if not os.getenv("DD_REMOTE_CONFIG_ENABLED"):
                 config._remote_config_enabled = False
                 log.debug("Remote configuration disabled because DD_LLMOBS_AGENTLESS_ENABLED is set to true.")
@@ -246,9 +278,10 @@ class LLMObs(Service):
 
     @classmethod
     def _integration_is_enabled(cls, integration: str) -> bool:
-        if integration not in SUPPORTED_LLMOBS_INTEGRATIONS:
+        integration_module = SUPPORTED_LLMOBS_INTEGRATIONS.get(integration)
+        if integration_module is None:
             return False
-        return SUPPORTED_LLMOBS_INTEGRATIONS[integration] in ddtrace._monkey._get_patched_modules()
+        return ddtrace._monkey._is_module_patched(integration_module)
 
     @classmethod
     def disable(cls) -> None:
@@ -260,7 +293,6 @@ class LLMObs(Service):
 
         cls.enabled = False
         cls._instance.stop()
-        cls._instance.tracer.deregister_on_start_span(cls._instance._do_annotations)
         telemetry_writer.product_activated(TELEMETRY_APM_PRODUCT.LLMOBS, False)
 
         log.debug("%s disabled", cls.__name__)
@@ -284,32 +316,42 @@ class LLMObs(Service):
         # id to track an annotation for registering / de-registering
         annotation_id = rand64bits()
 
-        def get_annotations_context_id():
-            current_ctx = cls._instance.tracer.current_trace_context()
+        def get_annotations_context_id(tracer):
+            current_ctx = tracer.current_trace_context()
             # default the context id to the annotation id
             ctx_id = annotation_id
             if current_ctx is None:
                 current_ctx = Context(is_remote=False)
                 current_ctx.set_baggage_item(ANNOTATIONS_CONTEXT_ID, ctx_id)
-                cls._instance.tracer.context_provider.activate(current_ctx)
-            elif not current_ctx.get_baggage_item(ANNOTATIONS_CONTEXT_ID):
-                current_ctx.set_baggage_item(ANNOTATIONS_CONTEXT_ID, ctx_id)
+                tracer.context_provider.activate(current_ctx)
             else:
-                ctx_id = current_ctx.get_baggage_item(ANNOTATIONS_CONTEXT_ID)
+                existing_ctx_id = current_ctx.get_baggage_item(ANNOTATIONS_CONTEXT_ID)
+                if existing_ctx_id:
+                    ctx_id = existing_ctx_id
+                else:
+                    current_ctx.set_baggage_item(ANNOTATIONS_CONTEXT_ID, ctx_id)
             return ctx_id
 
         def register_annotation():
-            with cls._instance._annotation_context_lock:
-                ctx_id = get_annotations_context_id()
-                cls._instance._annotations.append(
-                    (annotation_id, ctx_id, {"tags": tags, "prompt": prompt, "_name": name})
+            # resolve the service on entry, the context may have been created before LLMObs.enable()
+            instance = cls._instance
+            with instance._annotation_context_lock:
+                ctx_id = get_annotations_context_id(instance.tracer)
+                instance._annotations.setdefault(ctx_id, []).append(
+                    (annotation_id, {"tags": tags, "prompt": prompt, "_name": name})
                 )
-
-        def deregister_annotation():
-            with cls._instance._annotation_context_lock:
-                for i, (key, _, _) in enumerate(cls._instance._annotations):
+            # handed back on exit, the same context object may be entered several times
+            return instance, ctx_id
+
+        def deregister_annotation(registration):
+            instance, ctx_id = registration
+            with instance._annotation_context_lock:
+                annotations = instance._annotations.get(ctx_id, [])
+                for i, (key, _) in enumerate(annotations):
                     if key == annotation_id:
-                        cls._instance._annotations.pop(i)
+                        annotations.pop(i)
+                        if not annotations:
+                            del instance._annotations[ctx_id]
                         return
                 else:
                     log.debug("Failed to pop annotation context")
@@ -333,61 +375,57 @@ class LLMObs(Service):
     @staticmethod
     def _patch_integrations() -> None:
         """Patch LLM integrations."""
-        patch(**{integration: True for integration in SUPPORTED_LLMOBS_INTEGRATIONS.values()})  # type: ignore[arg-type]
-        log.debug("Patched LLM integrations: %s", list(SUPPORTED_LLMOBS_INTEGRATIONS.values()))
+        patch(**_LLMOBS_INTEGRATIONS_PATCH_KWARGS)  # type: ignore[arg-type]
+        log.debug("Patched LLM integrations: %s", list(_LLMOBS_INTEGRATIONS_PATCH_KWARGS))
 
     @classmethod
     def export_span(cls, span: Optional[Span] = None) -> Optional[ExportedLLMObsSpan]:
         """Returns a simple representation of a span to export its span and trace IDs.
         If no span is provided, the current active LLMObs-type span will be used.
         """
-        if span:
-            try:
-                if span.span_type != SpanTypes.LLM:
-                    log.warning("Span must be an LLMObs-generated span.")
-                    return None
-                return ExportedLLMObsSpan(span_id=str(span.span_id), trace_id="{:x}".format(span.trace_id))
-            except (TypeError, AttributeError):
-                log.warning("Failed to export span. Span must be a valid Span object.")
-                return None
-        span = cls._instance.tracer.current_span()
         if span is None:
-            log.warning("No span provided and no active LLMObs-generated span found.")
+            span = cls._instance.tracer.current_span()
+            if span is None:
+                log.warning("No span provided and no active LLMObs-generated span found.")
+                return None
+        elif not isinstance(span, Span):
+            log.warning("Failed to export span. Span must be a valid Span object.")
             return None
-        if span.span_type != SpanTypes.LLM:
+        if span.span_type != _SPAN_TYPE_LLM:
             log.warning("Span must be an LLMObs-generated span.")
             return None
-        return ExportedLLMObsSpan(span_id=str(span.span_id), trace_id="{:x}".format(span.trace_id))
+        return ExportedLLMObsSpan(span_id=f"{span.span_id}", trace_id=f"{span.trace_id:x}")
 
     def _start_span(
         self,
         operation_kind: str,
         name: Optional[str] = None,
         session_id: Optional[str] = None,
+        ml_app: Optional[str] = None,
         model_name: Optional[str] = None,
         model_provider: Optional[str] = None,
-        ml_app: Optional[str] = None,
     ) -> Span:
         if name is None:
             name = operation_kind
-        span = self.tracer.trace(name, resource=operation_kind, span_type=SpanTypes.LLM)
-        span.set_tag_str(SPAN_KIND, operation_kind)
+        span = self.tracer.trace(name, resource=operation_kind, span_type=_SPAN_TYPE_LLM)
+        set_tag_str = span.set_tag_str
+        set_tag_str(SPAN_KIND, operation_kind)
         if model_name is not None:
-            span.set_tag_str(MODEL_NAME, model_name)
+            set_tag_str(MODEL_NAME, model_name)
         if model_provider is not None:
-            span.set_tag_str(MODEL_PROVIDER, model_provider)
+            set_tag_str(MODEL_PROVIDER, model_provider)
         session_id = session_id if session_id is not None else _get_session_id(span)
         if session_id is not None:
-            span.set_tag_str(SESSION_ID, session_id)
+            set_tag_str(SESSION_ID, session_id)
         if ml_app is None:
             ml_app = _get_ml_app(span)
-        span.set_tag_str(ML_APP, ml_app)
+        set_tag_str(ML_APP, ml_app)
         if span.get_tag(PROPAGATED_PARENT_ID_KEY) is None:
             # For non-distributed traces or spans in the first service of a distributed trace,
             # The LLMObs parent ID tag is not set at span start time. We need to manually set the parent ID tag now
             # in these cases to avoid conflicting with the later propagated tags.
             parent_id = _get_llmobs_parent_id(span) or "undefined"
-            span.set_tag_str(PARENT_ID_KEY, str(parent_id))
+            set_tag_str(PARENT_ID_KEY, str(parent_id))
         return span
 
     @classmethod
@@ -418,9 +456,7 @@ class LLMObs(Service):
             model_name = "custom"
         if model_provider is None:
             model_provider = "custom"
-        return cls._instance._start_span(
-            "llm", name, model_name=model_name, model_provider=model_provider, session_id=session_id, ml_app=ml_app
-        )
+        return cls._instance._start_span("llm", name, session_id, ml_app, model_name, model_provider)
 
     @classmethod
     def tool(cls, name: Optional[str] = None, session_id: Optional[str] = None, ml_app: Optional[str] = None) -> Span:
@@ -436,7 +472,7 @@ class LLMObs(Service):
         """
         if cls.enabled is False:
             log.warning(SPAN_START_WHILE_DISABLED_WARNING)
-        return cls._instance._start_span("tool", name=name, session_id=session_id, ml_app=ml_app)
+        return cls._instance._start_span("tool", name, session_id, ml_app)
 
     @classmethod
     def task(cls, name: Optional[str] = None, session_id: Optional[str] = None, ml_app: Optional[str] = None) -> Span:
@@ -452,7 +488,7 @@ class LLMObs(Service):
         """
         if cls.enabled is False:
             log.warning(SPAN_START_WHILE_DISABLED_WARNING)
-        return cls._instance._start_span("task", name=name, session_id=session_id, ml_app=ml_app)
+        return cls._instance._start_span("task", name, session_id, ml_app)
 
     @classmethod
     def agent(cls, name: Optional[str] = None, session_id: Optional[str] = None, ml_app: Optional[str] = None) -> Span:
@@ -468,7 +504,7 @@ class LLMObs(Service):
         """
         if cls.enabled is False:
             log.warning(SPAN_START_WHILE_DISABLED_WARNING)
-        return cls._instance._start_span("agent", name=name, session_id=session_id, ml_app=ml_app)
+        return cls._instance._start_span("agent", name, session_id, ml_app)
 
     @classmethod
     def workflow(
@@ -486,7 +522,7 @@ class LLMObs(Service):
         """
         if cls.enabled is False:
             log.warning(SPAN_START_WHILE_DISABLED_WARNING)
-        return cls._instance._start_span("workflow", name=name, session_id=session_id, ml_app=ml_app)
+        return cls._instance._start_span("workflow", name, session_id, ml_app)
 
     @classmethod
     def embedding(
@@ -517,14 +553,7 @@ class LLMObs(Service):
             model_name = "custom"
         if model_provider is None:
             model_provider = "custom"
-        return cls._instance._start_span(
-            "embedding",
-            name,
-            model_name=model_name,
-            model_provider=model_provider,
-            session_id=session_id,
-            ml_app=ml_app,
-        )
+        return cls._instance._start_span("embedding", name, session_id, ml_app, model_name, model_provider)
 
     @classmethod
     def retrieval(
@@ -542,7 +571,7 @@ class LLMObs(Service):
         """
         if cls.enabled is False:
             log.warning(SPAN_START_WHILE_DISABLED_WARNING)
-        return cls._instance._start_span("retrieval", name=name, session_id=session_id, ml_app=ml_app)
+        return cls._instance._start_span("retrieval", name, session_id, ml_app)
 
     @classmethod
     def annotate(
@@ -590,22 +619,22 @@ class LLMObs(Service):
         """
         if span is None:
             span = cls._instance.tracer.current_span()
-            if span is None:
-                log.warning("No span provided and no active LLMObs-generated span found.")
-                return
-        if span.span_type != SpanTypes.LLM:
+        if span is None:
+            log.warning("No span provided and no active LLMObs-generated span found.")
+            return
+        elif span.span_type != _SPAN_TYPE_LLM:
             log.warning("Span must be an LLMObs-generated span.")
             return
-        if span.finished:
+        elif span.finished:
             log.warning("Cannot annotate a finished span.")
             return
+        span_kind = span.get_tag(SPAN_KIND)
         if metadata is not None:
             cls._tag_metadata(span, metadata)
         if metrics is not None:
             cls._tag_metrics(span, metrics)
         if tags is not None:
             cls._tag_span_tags(span, tags)
-        span_kind = span.get_tag(SPAN_KIND)
         if parameters is not None:
             log.warning("Setting parameters is deprecated, please set parameters and other metadata as tags instead.")
             cls._tag_params(span, parameters)
@@ -617,14 +646,7 @@ class LLMObs(Service):
             log.debug("Span kind not specified, skipping annotation for input/output data")
             return
         if input_data is not None or output_data is not None:
-            if span_kind == "llm":
-                cls._tag_llm_io(span, input_messages=input_data, output_messages=output_data)
-            elif span_kind == "embedding":
-                cls._tag_embedding_io(span, input_documents=input_data, output_text=output_data)
-            elif span_kind == "retrieval":
-                cls._tag_retrieval_io(span, input_text=input_data, output_documents=output_data)
-            else:
-                cls._tag_text_io(span, input_value=input_data, output_value=output_data)
+            getattr(cls, cls._IO_TAGGERS.get(span_kind, "_tag_text_io"))(span, input_data, output_data)
 
     @staticmethod
     def _tag_prompt(span, prompt: dict) -> None:
@@ -651,22 +673,25 @@ class LLMObs(Service):
         """Tags input/output messages for LLM-kind spans.
         Will be mapped to span's `meta.{input,output}.messages` fields.
         """
-        if input_messages is not None:
+        # an empty list tags nothing, skip building and validating a wrapper for it
+        if input_messages is not None and not (isinstance(input_messages, list) and not input_messages):
             try:
                 if not isinstance(input_messages, Messages):
                     input_messages = Messages(input_messages)
-                if input_messages.messages:
-                    span.set_tag_str(INPUT_MESSAGES, safe_json(input_messages.messages))
+                messages = input_messages.messages
+                if messages:
+                    span.set_tag_str(INPUT_MESSAGES, safe_json(messages))
             except TypeError:
                 log.warning("Failed to parse input messages.", exc_info=True)
-        if output_messages is None:
+        if output_messages is None or (isinstance(output_messages, list) and not output_messages):
             return
         try:
             if not isinstance(output_messages, Messages):
                 output_messages = Messages(output_messages)
-            if not output_messages.messages:
+            messages = output_messages.messages
+            if not messages:
                 return
-            span.set_tag_str(OUTPUT_MESSAGES, safe_json(output_messages.messages))
+            span.set_tag_str(OUTPUT_MESSAGES, safe_json(messages))
         except TypeError:
             log.warning("Failed to parse output messages.", exc_info=True)
 
@@ -675,12 +700,13 @@ class LLMObs(Service):
         """Tags input documents and output text for embedding-kind spans.
         Will be mapped to span's `meta.{input,output}.text` fields.
         """
-        if input_documents is not None:
+        if input_documents is not None and not (isinstance(input_documents, list) and not input_documents):
             try:
                 if not isinstance(input_documents, Documents):
                     input_documents = Documents(input_documents)
-                if input_documents.documents:
-                    span.set_tag_str(INPUT_DOCUMENTS, safe_json(input_documents.documents))
+                documents = input_documents.documents
+                if documents:
+                    span.set_tag_str(INPUT_DOCUMENTS, safe_json(documents))
             except TypeError:
                 log.warning("Failed to parse input documents.", exc_info=True)
         if output_text is None:
@@ -694,14 +720,15 @@ class LLMObs(Service):
         """
         if input_text is not None:
             span.set_tag_str(INPUT_VALUE, safe_json(input_text))
-        if output_documents is None:
+        if output_documents is None or (isinstance(output_documents, list) and not output_documents):
             return
         try:
             if not isinstance(output_documents, Documents):
                 output_documents = Documents(output_documents)
-            if not output_documents.documents:
+            documents = output_documents.documents
+            if not documents:
                 return
-            span.set_tag_str(OUTPUT_DOCUMENTS, safe_json(output_documents.documents))
+            span.set_tag_str(OUTPUT_DOCUMENTS, safe_json(documents))
         except TypeError:
             log.warning("Failed to parse output documents.", exc_info=True)
 
@@ -781,23 +808,84 @@ class LLMObs(Service):
         :param dict metadata: A JSON serializable dictionary of key-value metadata pairs relevant to the
                                 evaluation metric.
         """
+        if not cls._can_submit_evaluations("submit_evaluation"):
+            return
+        evaluation_metric = cls._evaluation_metric(
+            span_context, label, metric_type, value, tags, ml_app, timestamp_ms, metadata
+        )
+        if evaluation_metric is not None:
+            cls._instance._llmobs_eval_metric_writer.enqueue(evaluation_metric)
+
+    @classmethod
+    def submit_evaluations(cls, evaluations: List[Dict[str, Any]]) -> None:
+        """
+        Submits multiple custom evaluation metrics at once.
+
+        :param evaluations: A list of dictionaries, each holding the keyword arguments of a
+                            ``LLMObs.submit_evaluation()`` call. Invalid evaluations are skipped.
+        """
+        if not cls._can_submit_evaluations("submit_evaluations"):
+            return
+        if not isinstance(evaluations, list):
+            log.warning("evaluations must be a list of dictionaries of LLMObs.submit_evaluation() arguments.")
+            return
+        evaluation_metric_signature = inspect.signature(cls._evaluation_metric)
+        evaluation_metrics = []
+        for evaluation in evaluations:
+            if not isinstance(evaluation, dict):
+                log.warning("evaluations must be a list of dictionaries of LLMObs.submit_evaluation() arguments.")
+                continue
+            # only guard the argument binding, errors raised while validating are not argument errors
+            try:
+                arguments = evaluation_metric_signature.bind(**evaluation)
+            except TypeError:
+                log.warning("Invalid arguments for evaluation metric, skipping it.", exc_info=True)
+                continue
+            evaluation_metric = cls._evaluation_metric(*arguments.args, **arguments.kwargs)
+            if evaluation_metric is not None:
+                evaluation_metrics.append(evaluation_metric)
+        if evaluation_metrics:
+            # a single writer lock acquisition for the whole batch
+            cls._instance._llmobs_eval_metric_writer.enqueue_many(evaluation_metrics)
+
+    @classmethod
+    def _can_submit_evaluations(cls, method_name: str) -> bool:
         if cls.enabled is False:
             log.warning(
-                "LLMObs.submit_evaluation() called when LLMObs is not enabled. Evaluation metric data will not be sent."
+                "LLMObs.%s() called when LLMObs is not enabled. Evaluation metric data will not be sent.", method_name
             )
-            return
+            return False
         if not config._dd_api_key:
             log.warning(
                 "DD_API_KEY is required for sending evaluation metrics. Evaluation metric data will not be sent. "
                 "Ensure this configuration is set before running your application."
             )
-            return
+            return False
+        return True
+
+    @staticmethod
+    def _evaluation_metric(
+        span_context: Dict[str, str],
+        label: str,
+        metric_type: str,
+        value: Union[str, int, float],
+        tags: Optional[Dict[str, str]] = None,
+        ml_app: Optional[str] = None,
+        timestamp_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, object]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Validates the arguments of an evaluation metric and builds the event to submit, or None if invalid."""
         if not isinstance(span_context, dict):
             log.warning(
                 "span_context must be a dictionary containing both span_id and trace_id keys. "
                 "LLMObs.export_span() can be used to generate this dictionary from a given span."
             )
-            return
+            return None
+        span_id = span_context.get("span_id")
+        trace_id = span_context.get("trace_id")
+        if not (span_id and trace_id):
+            log.warning("span_id and trace_id must both be specified for the given evaluation metric to be submitted.")
+            return None
 
         ml_app = ml_app if ml_app else config._llmobs_ml_app
         if not ml_app:
@@ -805,28 +893,23 @@ class LLMObs(Service):
                 "ML App name is required for sending evaluation metrics. Evaluation metric data will not be sent. "
                 "Ensure this configuration is set before running your application."
             )
-            return
+            return None
 
-        timestamp_ms = timestamp_ms if timestamp_ms else int(time.time() * 1000)
+        timestamp_ms = timestamp_ms if timestamp_ms else time_ns() // 1_000_000
 
         if not isinstance(timestamp_ms, int) or timestamp_ms < 0:
             log.warning("timestamp_ms must be a non-negative integer. Evaluation metric data will not be sent")
-            return
+            return None
 
-        span_id = span_context.get("span_id")
-        trace_id = span_context.get("trace_id")
-        if not (span_id and trace_id):
-            log.warning("span_id and trace_id must both be specified for the given evaluation metric to be submitted.")
-            return
         if not label:
             log.warning("label must be the specified name of the evaluation metric.")
-            return
+            return None
 
-        if not metric_type or metric_type.lower() not in ("categorical", "numerical", "score"):
+        metric_type = metric_type.lower() if isinstance(metric_type, str) else None
+        if metric_type not in _VALID_METRIC_TYPES:
             log.warning("metric_type must be one of 'categorical' or 'score'.")
-            return
+            return None
 
-        metric_type = metric_type.lower()
         if metric_type == "numerical":
             log.warning(
                 "The evaluation metric type 'numerical' is unsupported. Use 'score' instead. "
@@ -836,36 +919,42 @@ class LLMObs(Service):
 
         if metric_type == "categorical" and not isinstance(value, str):
             log.warning("value must be a string for a categorical metric.")
-            return
+            return None
         if metric_type == "score" and not isinstance(value, (int, float)):
             log.warning("value must be an integer or float for a score metric.")
-            return
+            return None
         if tags is not None and not isinstance(tags, dict):
             log.warning("tags must be a dictionary of string key-value pairs.")
-            return
-
-        # initialize tags with default values that will be overridden by user-provided tags
-        evaluation_tags = {
-            "ddtrace.version": ddtrace.__version__,
-            "ml_app": ml_app,
-        }
+            return None
 
         if tags:
+            # initialize tags with default values that will be overridden by user-provided tags
+            evaluation_tags = {
+                "ddtrace.version": ddtrace.__version__,
+                "ml_app": ml_app,
+            }
             for k, v in tags.items():
+                # tags are documented as strings, only fall back to ensure_text for other types
+                if isinstance(k, str) and isinstance(v, str):
+                    evaluation_tags[k] = v
+                    continue
                 try:
                     evaluation_tags[ensure_text(k)] = ensure_text(v)
                 except TypeError:
                     log.warning("Failed to parse tags. Tags for evaluation metrics must be strings.")
+            evaluation_tag_list = [f"{k}:{v}" for k, v in evaluation_tags.items()]
+        else:
+            evaluation_tag_list = [f"ddtrace.version:{ddtrace.__version__}", f"ml_app:{ml_app}"]
 
         evaluation_metric = {
             "span_id": span_id,
             "trace_id": trace_id,
             "label": str(label),
-            "metric_type": metric_type.lower(),
+            "metric_type": metric_type,
             "timestamp_ms": timestamp_ms,
-            "{}_value".format(metric_type): value,
+            f"{metric_type}_value": value,
             "ml_app": ml_app,
-            "tags": ["{}:{}".format(k, v) for k, v in evaluation_tags.items()],
+            "tags": evaluation_tag_list,
         }
 
         if metadata:
@@ -876,7 +965,7 @@ class LLMObs(Service):
                 if metadata and isinstance(metadata, str):
                     evaluation_metric["metadata"] = json.loads(metadata)
 
-        cls._instance._llmobs_eval_metric_writer.enqueue(evaluation_metric)
+        return evaluation_metric
 
     @classmethod
     def inject_distributed_headers(cls, request_headers: Dict[str, str], span: Optional[Span] = None) -> Dict[str, str]:
@@ -1,5 +1,7 @@
 import json
+from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Union
 
@@ -53,18 +55,26 @@ class AnnotationContext:
     def __init__(self, _register_annotator, _deregister_annotator):
         self._register_annotator = _register_annotator
         self._deregister_annotator = _deregister_annotator
+        # one registration per active entry, so that each exit undoes a single entry
+        self._registrations = []  # type: List[Any]
 
     def __enter__(self):
-        self._register_annotator()
+        self._registrations.append(self._register_annotator())
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._deregister_annotator()
+        self._deregister()
 
     async def __aenter__(self):
-        self._register_annotator()
+        self._registrations.append(self._register_annotator())
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self._deregister_annotator()
+        self._deregister()
+
+    def _deregister(self):
+        if not self._registrations:
+            log.debug("Annotation context exited without being entered")
+            return
+        self._deregister_annotator(self._registrations.pop())
 
 
 def _get_attr(o: object, attr: str, default: object):
@@ -156,10 +166,14 @@ def _unserializable_default_repr(obj):
     return default_repr
 
 
+# json.dumps builds a new encoder on every call when given non-default options, reuse a single one instead
+_safe_json_encode = json.JSONEncoder(skipkeys=True, default=_unserializable_default_repr).encode
+
+
 def safe_json(obj):
     if isinstance(obj, str):
         return obj
     try:
-        return json.dumps(obj, skipkeys=True, default=_unserializable_default_repr)
+        return _safe_json_encode(obj)
     except Exception:
         log.error("Failed to serialize object to JSON.", exc_info=True)
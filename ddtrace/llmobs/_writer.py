@@ -99,6 +99,19 @@ class BaseLLMObsWriter(PeriodicService):
                 return
             self._buffer.append(event)
 
+    def _enqueue_many(self, events: List[Union[LLMObsSpanEvent, LLMObsEvaluationMetricEvent]]) -> None:
+        with self._lock:
+            available = max(self._buffer_limit - len(self._buffer), 0)
+            if len(events) > available:
+                logger.warning(
+                    "%r event buffer full (limit is %d), dropping %d events",
+                    self.__class__.__name__,
+                    self._buffer_limit,
+                    len(events) - available,
+                )
+                events = events[:available]
+            self._buffer.extend(events)
+
     def periodic(self) -> None:
         with self._lock:
             if not self._buffer:
@@ -163,6 +176,9 @@ class LLMObsEvalMetricWriter(BaseLLMObsWriter):
     def enqueue(self, event: LLMObsEvaluationMetricEvent) -> None:
         self._enqueue(event)
 
+    def enqueue_many(self, events: List[LLMObsEvaluationMetricEvent]) -> None:
+        self._enqueue_many(events)
+
     def _data(self, events: List[LLMObsEvaluationMetricEvent]) -> Dict[str, Any]:
         return {"data": {"type": "evaluation_metric", "attributes": {"metrics": events}}}
 
@@ -27,9 +27,10 @@ class Messages:
         self.messages = []
         if not isinstance(messages, list):
             messages = [messages]  # type: ignore[list-item]
+        append = self.messages.append
         for message in messages:
             if isinstance(message, str):
-                self.messages.append(Message(content=message))
+                append(Message(content=message))
                 continue
             elif not isinstance(message, dict):
                 raise TypeError("messages must be a string, dictionary, or list of dictionaries.")
@@ -38,11 +39,11 @@ class Messages:
             if not isinstance(content, str):
                 raise TypeError("Message content must be a string.")
             if not role:
-                self.messages.append(Message(content=content))
+                append(Message(content=content))
                 continue
             if not isinstance(role, str):
                 raise TypeError("Message role must be a string, and one of .")
-            self.messages.append(Message(content=content, role=role))
+            append(Message(content=content, role=role))
 
 
 class Documents:
@@ -50,9 +51,10 @@ class Documents:
         self.documents = []
         if not isinstance(documents, list):
             documents = [documents]  # type: ignore[list-item]
+        append = self.documents.append
         for document in documents:
             if isinstance(document, str):
-                self.documents.append(Document(text=document))
+                append(Document(text=document))
                 continue
             elif not isinstance(document, dict):
                 raise TypeError("documents must be a string, dictionary, or list of dictionaries.")
@@ -75,4 +77,4 @@ class Documents:
                 if not isinstance(document_score, (int, float)):
                     raise TypeError("document score must be an integer or float.")
                 formatted_document["score"] = document_score
-            self.documents.append(formatted_document)
+            append(formatted_document)
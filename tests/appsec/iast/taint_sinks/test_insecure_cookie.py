@@ -1,3 +1,6 @@
+from ddtrace.appsec._constants import IAST_SPAN_TAGS
+from ddtrace.appsec._iast._metrics import get_iast_span_metrics
+from ddtrace.appsec._iast._metrics import reset_iast_span_metrics
 from ddtrace.appsec._iast.constants import VULN_INSECURE_COOKIE
 from ddtrace.appsec._iast.constants import VULN_NO_HTTPONLY_COOKIE
 from ddtrace.appsec._iast.constants import VULN_NO_SAMESITE_COOKIE
@@ -110,6 +113,52 @@ def test_nosamesite_cookies_strict_no_error(iast_context_defaults):
     assert not span_report
 
 
+def test_nosamesite_cookies_mixed_case_and_spaces_no_error(iast_context_defaults):
+    cookies = {"foo": "bar; Secure; HttpOnly; Path=/; SameSite=Strict"}
+    asm_check_cookies(cookies)
+
+    span_report = _get_span_report()
+
+    assert not span_report
+
+
+def test_nosamesite_cookies_none_canonical_spelling(iast_context_defaults):
+    cookies = {"foo": "bar; Path=/; SameSite=None; Secure; HttpOnly"}
+    asm_check_cookies(cookies)
+
+    span_report = _get_span_report()
+
+    vulnerabilities = list(span_report.vulnerabilities)
+
+    assert len(vulnerabilities) == 1
+    assert vulnerabilities[0].type == VULN_NO_SAMESITE_COOKIE
+    assert vulnerabilities[0].evidence.value == "foo"
+
+
+def test_empty_cookies_no_error(iast_context_defaults):
+    cookies = {"foo": "", "bar": ";httponly;path=/;samesite=strict", "baz": '""; Path=/'}
+    asm_check_cookies(cookies)
+
+    span_report = _get_span_report()
+
+    assert not span_report
+
+
+def test_insecure_cookies_executed_sink_metric_batched(iast_context_defaults):
+    reset_iast_span_metrics()
+    cookies = {"foo": "bar", "baz": "qux;secure", "spam": "eggs;secure;httponly;samesite=lax"}
+    asm_check_cookies(cookies)
+
+    metrics = get_iast_span_metrics()
+    assert metrics[IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK + "." + VULN_INSECURE_COOKIE.lower()] == 1
+    assert metrics[IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK + "." + VULN_NO_HTTPONLY_COOKIE.lower()] == 2
+    assert metrics[IAST_SPAN_TAGS.TELEMETRY_EXECUTED_SINK + "." + VULN_NO_SAMESITE_COOKIE.lower()] == 2
+
+    span_report = _get_span_report()
+    assert len(span_report.vulnerabilities) == 5
+    reset_iast_span_metrics()
+
+
 def test_insecure_cookies_deduplication(iast_context_deduplication_enabled):
     _end_iast_context_and_oce()
     for num_vuln_expected in [1, 0, 0]:
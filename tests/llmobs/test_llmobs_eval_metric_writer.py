@@ -51,6 +51,16 @@ def test_buffer_limit(mock_writer_logs):
     )
 
 
+def test_buffer_limit_enqueue_many(mock_writer_logs):
+    llmobs_eval_metric_writer = LLMObsEvalMetricWriter(site="datadoghq.com", api_key="asdf", interval=1000, timeout=1)
+    llmobs_eval_metric_writer.enqueue_many([{}] * 999)
+    llmobs_eval_metric_writer.enqueue_many([{}] * 3)
+    assert len(llmobs_eval_metric_writer._buffer) == 1000
+    mock_writer_logs.warning.assert_called_with(
+        "%r event buffer full (limit is %d), dropping %d events", "LLMObsEvalMetricWriter", 1000, 2
+    )
+
+
 @pytest.mark.vcr_logs
 def test_send_metric_bad_api_key(mock_writer_logs):
     llmobs_eval_metric_writer = LLMObsEvalMetricWriter(
@@ -10,6 +10,7 @@ from ddtrace._trace.context import Context
 from ddtrace._trace.span import Span
 from ddtrace.ext import SpanTypes
 from ddtrace.filters import TraceFilter
+from ddtrace.internal import forksafe
 from ddtrace.internal.service import ServiceStatus
 from ddtrace.llmobs import LLMObs as llmobs_service
 from ddtrace.llmobs._constants import INPUT_DOCUMENTS
@@ -30,6 +31,8 @@ from ddtrace.llmobs._constants import SPAN_KIND
 from ddtrace.llmobs._constants import SPAN_START_WHILE_DISABLED_WARNING
 from ddtrace.llmobs._constants import TAGS
 from ddtrace.llmobs._llmobs import LLMObsTraceProcessor
+from ddtrace.llmobs.utils import Documents
+from ddtrace.llmobs.utils import Messages
 from ddtrace.llmobs.utils import Prompt
 from tests.llmobs._utils import _expected_llmobs_eval_metric_event
 from tests.llmobs._utils import _expected_llmobs_llm_span_event
@@ -94,6 +97,18 @@ def test_service_disable():
         assert llmobs_service._instance._evaluator_runner.status.value == "stopped"
 
 
+def test_service_hooks_registered_only_while_enabled():
+    with override_global_config(dict(_dd_api_key="<not-a-real-api-key>", _llmobs_ml_app="<ml-app-name>")):
+        dummy_tracer = DummyTracer()
+        llmobs_service.enable(_tracer=dummy_tracer)
+        llmobs_instance = llmobs_service._instance
+        assert llmobs_instance._hooks_registered is True
+        assert llmobs_instance._child_after_fork in forksafe._registry
+        llmobs_service.disable()
+        assert llmobs_instance._hooks_registered is False
+        assert llmobs_instance._child_after_fork not in forksafe._registry
+
+
 def test_service_enable_no_api_key():
     with override_global_config(dict(_dd_api_key="", _llmobs_ml_app="<ml-app-name>")):
         dummy_tracer = DummyTracer()
@@ -452,6 +467,25 @@ def test_annotate_tag_non_serializable_marks_with_placeholder_value(LLMObs):
             )
 
 
+def test_annotate_empty_lists_do_not_tag_span(LLMObs):
+    with mock.patch.object(Messages, "__init__", return_value=None) as mock_messages_init, mock.patch.object(
+        Documents, "__init__", return_value=None
+    ) as mock_documents_init:
+        with LLMObs.llm(model_name="test_model") as llm_span:
+            LLMObs.annotate(span=llm_span, input_data=[], output_data=[])
+            assert llm_span.get_tag(INPUT_MESSAGES) is None
+            assert llm_span.get_tag(OUTPUT_MESSAGES) is None
+        with LLMObs.embedding(model_name="test_model") as embedding_span:
+            LLMObs.annotate(span=embedding_span, input_data=[])
+            assert embedding_span.get_tag(INPUT_DOCUMENTS) is None
+        with LLMObs.retrieval() as retrieval_span:
+            LLMObs.annotate(span=retrieval_span, output_data=[])
+            assert retrieval_span.get_tag(OUTPUT_DOCUMENTS) is None
+    # the empty lists are skipped before building a wrapper for them
+    mock_messages_init.assert_not_called()
+    mock_documents_init.assert_not_called()
+
+
 def test_annotate_input_string(LLMObs):
     with LLMObs.llm(model_name="test_model") as llm_span:
         LLMObs.annotate(span=llm_span, input_data="test_input")
@@ -1001,7 +1035,7 @@ def test_submit_evaluation_llmobs_disabled_raises_warning(LLMObs, mock_logs):
         span_context={"span_id": "123", "trace_id": "456"}, label="toxicity", metric_type="categorical", value="high"
     )
     mock_logs.warning.assert_called_once_with(
-        "LLMObs.submit_evaluation() called when LLMObs is not enabled. Evaluation metric data will not be sent."
+        "LLMObs.%s() called when LLMObs is not enabled. Evaluation metric data will not be sent.", "submit_evaluation"
     )
 
 
@@ -1198,6 +1232,66 @@ def test_submit_evaluation_metric_tags(LLMObs, mock_llmobs_eval_metric_writer):
     )
 
 
+def test_submit_evaluations_enqueues_valid_metrics_at_once(LLMObs, mock_llmobs_eval_metric_writer, mock_logs):
+    LLMObs.submit_evaluations(
+        [
+            dict(
+                span_context={"span_id": "123", "trace_id": "456"},
+                label="toxicity",
+                metric_type="categorical",
+                value="high",
+                ml_app="ml_app_override",
+            ),
+            dict(
+                span_context={"span_id": "123", "trace_id": "456"}, label="sentiment", metric_type="score", value="0.9"
+            ),
+            dict(span_context={"span_id": "123", "trace_id": "456"}, unknown_argument=True),
+            dict(span_context={"span_id": "123", "trace_id": "456"}, label="sentiment", metric_type=5, value=0.9),
+            dict(
+                span_context={"span_id": "123", "trace_id": "456"},
+                label="sentiment",
+                metric_type="score",
+                value=0.9,
+                ml_app="ml_app_override",
+            ),
+        ]
+    )
+    mock_logs.warning.assert_any_call("value must be an integer or float for a score metric.")
+    mock_logs.warning.assert_any_call("metric_type must be one of 'categorical' or 'score'.")
+    mock_logs.warning.assert_any_call("Invalid arguments for evaluation metric, skipping it.", exc_info=True)
+    mock_llmobs_eval_metric_writer.enqueue.assert_not_called()
+    mock_llmobs_eval_metric_writer.enqueue_many.assert_called_once_with(
+        [
+            _expected_llmobs_eval_metric_event(
+                ml_app="ml_app_override",
+                span_id="123",
+                trace_id="456",
+                label="toxicity",
+                metric_type="categorical",
+                categorical_value="high",
+                tags=["ddtrace.version:{}".format(ddtrace.__version__), "ml_app:ml_app_override"],
+            ),
+            _expected_llmobs_eval_metric_event(
+                ml_app="ml_app_override",
+                span_id="123",
+                trace_id="456",
+                label="sentiment",
+                metric_type="score",
+                score_value=0.9,
+                tags=["ddtrace.version:{}".format(ddtrace.__version__), "ml_app:ml_app_override"],
+            ),
+        ]
+    )
+
+
+def test_submit_evaluations_not_a_list_raises_warning(LLMObs, mock_llmobs_eval_metric_writer, mock_logs):
+    LLMObs.submit_evaluations(None)
+    mock_logs.warning.assert_called_once_with(
+        "evaluations must be a list of dictionaries of LLMObs.submit_evaluation() arguments."
+    )
+    mock_llmobs_eval_metric_writer.enqueue_many.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "ddtrace_global_config",
     [dict(ddtrace="1.2.3", env="test_env", service="test_service", _llmobs_ml_app="test_app_name")],
@@ -1773,6 +1867,63 @@ def test_annotation_context_nested(LLMObs):
                 assert json.loads(span.get_tag(TAGS)) == {"foo": "baz", "boo": "bar"}
 
 
+def test_annotation_context_nested_deregisters_annotations(LLMObs):
+    with LLMObs.annotation_context(tags={"foo": "bar"}):
+        with LLMObs.annotation_context(tags={"foo": "baz"}):
+            assert [len(annotations) for annotations in LLMObs._instance._annotations.values()] == [2]
+            with LLMObs.agent(name="test_agent") as span:
+                assert json.loads(span.get_tag(TAGS)) == {"foo": "baz"}
+        assert [len(annotations) for annotations in LLMObs._instance._annotations.values()] == [1]
+    assert LLMObs._instance._annotations == {}
+
+
+def test_annotation_context_reentered(LLMObs):
+    annotation_ctx = LLMObs.annotation_context(tags={"a": "b"})
+    with annotation_ctx:
+        with annotation_ctx:
+            pass
+        with LLMObs.agent(name="test_agent") as span:
+            assert json.loads(span.get_tag(TAGS)) == {"a": "b"}
+    assert LLMObs._instance._annotations == {}
+
+
+def test_annotation_context_reentered_concurrently(LLMObs):
+    annotation_ctx = LLMObs.annotation_context(tags={"a": "b"})
+    entered = threading.Barrier(2)
+    spans_tags = []
+
+    def enter_under(tags):
+        with LLMObs.annotation_context(tags=tags):
+            with annotation_ctx:
+                entered.wait()
+                with LLMObs.agent(name="test_agent") as span:
+                    spans_tags.append(json.loads(span.get_tag(TAGS)))
+                entered.wait()
+
+    threads = [threading.Thread(target=enter_under, args=({"thread": str(i)},)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(spans_tags, key=lambda tags: tags["thread"]) == [
+        {"thread": "0", "a": "b"},
+        {"thread": "1", "a": "b"},
+    ]
+    assert LLMObs._instance._annotations == {}
+
+
+def test_annotation_context_created_before_enable(mock_llmobs_span_writer):
+    annotation_ctx = llmobs_service.annotation_context(tags={"a": "b"})
+    with override_global_config(dict(_dd_api_key="<not-a-real-api-key>", _llmobs_ml_app="<ml-app-name>")):
+        llmobs_service.enable(_tracer=DummyTracer())
+        with annotation_ctx:
+            with llmobs_service.agent(name="test_agent") as span:
+                assert json.loads(span.get_tag(TAGS)) == {"a": "b"}
+        assert llmobs_service._instance._annotations == {}
+        llmobs_service.disable()
+
+
 def test_annotation_context_nested_overrides_name(LLMObs):
     with LLMObs.annotation_context(name="unexpected"):
         with LLMObs.annotation_context(name="expected"):
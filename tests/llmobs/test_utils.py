@@ -1,5 +1,6 @@
 import pytest
 
+from ddtrace.llmobs._utils import safe_json
 from ddtrace.llmobs.utils import Documents
 from ddtrace.llmobs.utils import Messages
 
@@ -99,3 +100,10 @@ def test_documents_dictionary_with_incorrect_value_types():
         Documents({"text": "hello", "name": {"key": "value"}})
     with pytest.raises(TypeError):
         Documents([{"text": "hello", "score": "123"}])
+
+
+def test_safe_json():
+    assert safe_json("already a string") == "already a string"
+    assert safe_json({"key": ["value", 1, None]}) == '{"key": ["value", 1, null]}'
+    assert safe_json({("skipped",): "key", "kept": "key"}) == '{"kept": "key"}'
+    assert safe_json({"obj": object}) == '{"obj": "[Unserializable object: <class \'object\'>]"}'
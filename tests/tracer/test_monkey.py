@@ -30,6 +30,7 @@ class TestPatching(SubprocessTestCase):
         # Manual patching should not be affected by the environment variable override.
         _monkey.patch(sqlite3=True)
         assert "sqlite3" in _monkey._PATCHED_MODULES
+        assert _monkey._is_module_patched("sqlite3")
 
     @run_in_subprocess()
     def test_patch_raise_exception_manual_patch(self):